@@ -18,6 +18,9 @@ What this script does
    - Scraped from IOC station list page and resolved by exact (COUNTRY, LOCATION) match:
      https://www.ioc-sealevelmonitoring.org/list.php
    - If not found: leave blank (human fills)
+   - Only when rows are reviewed (--interactive / --phase ocr): a LOCATION that matches
+     exactly one IOC station is suggested even if COUNTRY differs, flagged for review
+     and noted in COMMENTS
 7) Optional: geocode LAT/LON from (LOCATION, STATE, COUNTRY) using Nominatim
 8) Human-in-the-loop review:
    - If a field is missing or fails allow-list matching, we get a quick CLI prompt to accept/edit
@@ -27,6 +30,11 @@ Install (pip)
   pip install opencv-python pillow pytesseract openpyxl numpy requests beautifulsoup4 \
               google-api-python-client google-auth-httplib2 google-auth-oauthlib geopy
 
+Optional (faster): pip install tesserocr lxml PyTurboJPEG orjson
+  - tesserocr keeps one in-process Tesseract handle per worker instead of forking per OCR call
+  - lxml parses the IOC station list in C (BeautifulSoup is used otherwise)
+  - PyTurboJPEG decodes JPEG marigrams straight to grayscale with libjpeg-turbo
+
 System deps
   - Tesseract binary installed and on PATH
 
@@ -39,27 +47,54 @@ Google Drive Auth
 from __future__ import annotations
 
 import argparse
+import atexit
+import csv
+import hashlib
 import io
 import json
+import multiprocessing
+import os
+import pickle
+import queue
 import random
 import re
+import shelve
+import sqlite3
+import struct
 import sys
+import threading
 import time
-from dataclasses import dataclass, asdict
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from contextlib import closing
+from dataclasses import dataclass
+from email.utils import formatdate
+from functools import lru_cache
+from multiprocessing.util import Finalize
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+from xml.sax.saxutils import escape as xml_escape
+
+# Tesseract's own OpenMP threads thrash when several images already OCR in parallel.
+# Must be set before pytesseract spawns anything; workers inherit it.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
 
 import cv2  # type: ignore
 import numpy as np  # type: ignore
 import pytesseract  # type: ignore
 import requests  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
+from urllib3.util.retry import Retry  # type: ignore
 from PIL import Image  # type: ignore
 from bs4 import BeautifulSoup  # type: ignore
 
-# Excel appending without re-reading the whole file each time
-from openpyxl import Workbook, load_workbook  # type: ignore
+# Excel: existing workbook read with openpyxl (read-only); output sheet XML is written directly
+from openpyxl import load_workbook  # type: ignore
 
 # Google Drive API
+import httplib2  # type: ignore
+from google_auth_httplib2 import AuthorizedHttp  # type: ignore
 from googleapiclient.discovery import build  # type: ignore
 from googleapiclient.errors import HttpError  # type: ignore
 from googleapiclient.http import MediaIoBaseDownload  # type: ignore
@@ -67,6 +102,31 @@ from google.oauth2.credentials import Credentials  # type: ignore
 from google_auth_oauthlib.flow import InstalledAppFlow  # type: ignore
 from google.auth.transport.requests import Request  # type: ignore
 
+# In-process Tesseract (optional; falls back to pytesseract's subprocess wrapper)
+try:
+    from tesserocr import PyTessBaseAPI  # type: ignore
+except Exception:
+    PyTessBaseAPI = None
+
+# JPEG decoding (optional; falls back to cv2.imdecode)
+try:
+    from turbojpeg import TurboJPEG, TJPF_GRAY  # type: ignore
+except Exception:
+    TurboJPEG = None
+    TJPF_GRAY = None
+
+# Progress log JSON (optional; falls back to the stdlib json module)
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+# IOC list parsing (optional; falls back to BeautifulSoup's pure-Python parser)
+try:
+    import lxml.html as LH  # type: ignore
+except Exception:
+    LH = None
+
 # geocoding
 try:
     from geopy.geocoders import Nominatim  # type: ignore
@@ -79,11 +139,11 @@ except Exception:
 # ---------------------------
 # Output columns
 # ---------------------------
-DEFAULT_COLUMNS = [
+DEFAULT_COLUMNS = (
     "FILE_NAME", "COUNTRY", "STATE", "LOCATION", "LOCATION_SHORT", "REGION_CODE",
     "START_RECORD", "END_RECORD", "TSEVENT_ID", "TSRUNUP_ID", "RECORDED_DATE",
     "LATITUDE", "LONGITUDE", "IMAGES", "SCALE", "MICROFILM_NAME", "COMMENTS",
-]
+)
 
 # ---------------------------
 # NOAA descriptor endpoints
@@ -95,6 +155,15 @@ NOAA_LOCATIONS_URL = "https://www.ngdc.noaa.gov/hazel/hazard-service/api/v1/desc
 
 # IOC station list (LOCATION_SHORT)
 IOC_LIST_URL = "https://www.ioc-sealevelmonitoring.org/list.php"
+# Bumped whenever key normalisation changes, so older <ioc-cache>.index.pkl files are rebuilt.
+_IOC_INDEX_FORMAT = 2
+
+# Reference data changes on the order of months; keep it locally for a week.
+REFDATA_CACHE_PATH = Path.home() / ".cache" / "wavesource" / "refdata.sqlite"
+REFDATA_TTL_S = 7 * 24 * 3600
+
+# Nominatim answers, keyed by normalized query (same station recurs across many images)
+GEOCODE_CACHE_PATH = Path.home() / ".cache" / "wavesource" / "geo.db"
 
 # ---------------------------
 # Regexes
@@ -104,6 +173,15 @@ DATE_PATTERNS = [
     re.compile(r"(?<!\d)(?P<m>0?[1-9]|1[0-2])[\-/](?P<d>0?[1-9]|[12]\d|3[01])[\-/](?P<y>19\d{2}|20\d{2})(?!\d)"),
     re.compile(r"(?<!\w)(?P<d>0?[1-9]|[12]\d|3[01])\s+(?P<mon>Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\s+(?P<y>19\d{2}|20\d{2})(?!\w)", re.I),
 ]
+# All DATE_PATTERNS as one alternation so the OCR text is scanned once. Group names get a
+# per-pattern suffix (y_0, y_1, ...) because `re` forbids duplicate names.
+DATE_RE = re.compile(
+    "|".join(
+        "(?:" + re.sub(r"\(\?P<(\w+)>", rf"(?P<\g<1>_{i}>", p.pattern) + ")"
+        for i, p in enumerate(DATE_PATTERNS)
+    ),
+    re.I,
+)
 MONTH_MAP = {'JAN':'01','FEB':'02','MAR':'03','APR':'04','MAY':'05','JUN':'06','JUL':'07','AUG':'08','SEP':'09','SEPT':'09','OCT':'10','NOV':'11','DEC':'12'}
 
 SCALE_PATTERNS = [
@@ -114,18 +192,38 @@ SCALE_PATTERNS = [
 UPPER_TRIPLE_SPLIT = re.compile(
     r"^([A-Z][A-Z\- .'()&/]+?)\s{2,}([A-Z][A-Z\- .'()&/]+?)\s{2,}([A-Z0-9][A-Z0-9\- .,'()&/]+)$"
 )
+# Same, applied once to a newline-joined block (separators may not span lines)
+UPPER_TRIPLE_SPLIT_M = re.compile(UPPER_TRIPLE_SPLIT.pattern.replace(r"\s{2,}", r"[ \t]{2,}"), re.M)
+
+# "COUNTRY: X" / "STATE - Y" / "LOCATION Z" labels, all found in one scan. A value stops
+# before the next label, so a one-line "COUNTRY: X  STATE: Y  LOCATION: Z" header splits
+# correctly; the matched group's name (m.lastgroup) is the label. No digits in COUNTRY.
+_NOT_LABEL = r"(?!\b(?:COUNTRY|STATE|LOCATION)\b)"
+FIELD_LABEL_RE = re.compile(
+    rf"\bCOUNTRY[:\-\s]+(?P<COUNTRY>(?:{_NOT_LABEL}[A-Z .,'()&/-]){{2,60}})"
+    rf"|\bSTATE[:\-\s]+(?P<STATE>(?:{_NOT_LABEL}[A-Z0-9 .,'()&/-]){{2,60}})"
+    rf"|\bLOCATION[:\-\s]+(?P<LOCATION>(?:{_NOT_LABEL}[A-Z0-9 .,'()&/-]){{2,60}})",
+    re.I,
+)
 
 # Strict IOC code appearance (4-5 usually, allow 3-6 to be safe)
 IOC_CODE_RE = re.compile(r"^[A-Za-z0-9]{3,6}$")
 
 # Quick “anchors” that are common on these sheets
-OCR_ANCHORS = [
-    r"\bCOUNTRY\b",
-    r"\bSTATE\b",
-    r"\bLOCATION\b",
-    r"\bSCALE\b",
-    r"\bREGION\b",
-]
+OCR_ANCHORS = ("COUNTRY", "STATE", "LOCATION", "SCALE", "REGION")
+# One alternation = one scan of the OCR text instead of one per anchor
+ANCHOR_RE = re.compile(r"\b(" + "|".join(OCR_ANCHORS) + r")\b")
+
+# Best possible _anchor_score: every anchor + date (2) + scale (1).
+MAX_ANCHOR = len(OCR_ANCHORS) + 3
+# Stop trying variants once one hits MAX_ANCHOR at (at least) this confidence.
+EARLY_CONF = 80.0
+# Plain grayscale at MAX_ANCHOR and this confidence skips preprocessing altogether.
+FAST_PATH_CONF = 85.0
+
+# Tesseract gains nothing past ~300 DPI; larger scans are shrunk before thresholding
+# (default for --max-long-edge).
+MAX_LONG_EDGE = 2000
 
 
 # ---------------------------
@@ -151,6 +249,17 @@ class Row:
     MICROFILM_NAME: str = ""
     COMMENTS: str = ""
 
+@dataclass
+class Job:
+    """One image for the OCR pool (picklable). Image bytes when held in memory, else a local path."""
+    file_id: str
+    rel_path: str
+    local_path: Optional[str] = None
+    data: Optional[bytes] = None
+
+# Row -> tuple in DEFAULT_COLUMNS order, in one C call (asdict deep-copies every row)
+_COL_GETTER = attrgetter(*DEFAULT_COLUMNS)
+
 
 # ---------------------------
 # Small utils
@@ -158,101 +267,359 @@ class Row:
 def _upper(s: str) -> str:
     return (s or "").strip().upper()
 
+# form feed -> space, zero-width chars dropped: one C-level str.translate pass
+_SANITIZE_TABLE = str.maketrans({"\x0c": " ", "\u200b": None, "\u200c": None, "\u200d": None})
+_SPACES_RE = re.compile(r"[ \t]+")
+
 def sanitize_text(text: str) -> str:
-    text = text.replace("\x0c", " ")
-    text = re.sub(r"[\u200b\u200c\u200d]", "", text)
-    text = re.sub(r"[ \t]+", " ", text)
-    return text
+    return _SPACES_RE.sub(" ", text.translate(_SANITIZE_TABLE))
 
 def safe_filename(name: str) -> str:
     name = re.sub(r"[^\w.\- ]+", "_", name)
     return name.strip() or "file"
 
+_IMAGE_EXTS = (".tif", ".tiff", ".png", ".jpg", ".jpeg", ".webp", ".bmp")
+
 def is_image_name(name: str) -> bool:
-    ext = Path(name).suffix.lower()
-    return ext in {".tif", ".tiff", ".png", ".jpg", ".jpeg", ".webp"}
+    # str.endswith(tuple) is one C call; no Path object per Drive entry
+    return name.lower().endswith(_IMAGE_EXTS)
+
+def journal_path(xlsx_path: str) -> Path:
+    """Sibling CSV that rows are appended to while a run is in progress."""
+    p = Path(xlsx_path)
+    return p.with_name(p.name + ".pending.csv")
+
+_XLSX_STATIC_PARTS = (
+    ("[Content_Types].xml",
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+     '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+     '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+     '<Default Extension="xml" ContentType="application/xml"/>'
+     '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+     '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+     '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+     '</Types>'),
+    ("_rels/.rels",
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+     '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+     '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+     '</Relationships>'),
+    ("xl/_rels/workbook.xml.rels",
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+     '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+     '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+     '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+     '</Relationships>'),
+    ("xl/styles.xml",
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+     '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+     '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+     '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+     '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+     '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+     '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+     '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+     '</styleSheet>'),
+)
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{title}" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+_XLSX_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_XLSX_SHEET_TAIL = "</sheetData></worksheet>"
+# Every part XlsxStreamWriter writes. A workbook with exactly these parts is one we wrote
+# (one sheet, no formatting), so it can be re-streamed without losing anything.
+_XLSX_OWN_PARTS = frozenset([name for name, _ in _XLSX_STATIC_PARTS] + ["xl/workbook.xml", "xl/worksheets/sheet1.xml"])
+# Control chars that XML 1.0 cannot carry (OCR text occasionally contains them)
+_XML_ILLEGAL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+def _col_letter(n: int) -> str:
+    out = ""
+    while n:
+        n, r = divmod(n - 1, 26)
+        out = chr(65 + r) + out
+    return out
 
-def ensure_excel(path: str) -> None:
-    p = Path(path)
-    if p.exists():
-        return
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-    ws.append(DEFAULT_COLUMNS)
-    wb.save(path)
+_COL_LETTERS = [_col_letter(i) for i in range(1, 703)]  # A..ZZ
 
-def append_rows_to_excel(path: str, rows: List[Row]) -> None:
+class XlsxStreamWriter:
     """
-    Appends rows without loading the entire sheet into memory each time.
-    This stays fast even when you’re writing thousands of images.
+    Minimal single-sheet .xlsx writer: sheet XML is formatted by hand and streamed into
+    the zip, so there are no per-cell Python objects. Every value is written as an
+    inline string (ExcelSink only ever re-streams text), None as an empty cell.
+    """
+
+    def __init__(self, path: str, sheet_title: str = "Sheet1") -> None:
+        self._zf = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+        for name, xml in _XLSX_STATIC_PARTS:
+            self._zf.writestr(name, xml)
+        self._zf.writestr("xl/workbook.xml", _XLSX_WORKBOOK.format(title=xml_escape(sheet_title, {'"': "&quot;"})))
+        self._sheet = io.TextIOWrapper(self._zf.open("xl/worksheets/sheet1.xml", "w"), encoding="utf-8")
+        self._sheet.write(_XLSX_SHEET_HEAD)
+        self._row = 0
+
+    def append(self, values: Iterable[object]) -> None:
+        self._row += 1
+        r = self._row
+        cells = []
+        for i, v in enumerate(values):
+            if v is None or v == "":
+                continue
+            ref = f"{_COL_LETTERS[i] if i < len(_COL_LETTERS) else _col_letter(i + 1)}{r}"
+            t = xml_escape(_XML_ILLEGAL_RE.sub("", str(v)))
+            cells.append(f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{t}</t></is></c>')
+        self._sheet.write(f'<row r="{r}">{"".join(cells)}</row>')
+
+    def append_text(self, values: Tuple[str, ...]) -> None:
+        """append() for all-string rows (every Row field is a str): no per-cell type checks."""
+        self._row += 1
+        r = self._row
+        self._sheet.write(f'<row r="{r}">' + "".join(
+            f'<c r="{col}{r}" t="inlineStr"><is><t xml:space="preserve">{xml_escape(_XML_ILLEGAL_RE.sub("", v))}</t></is></c>'
+            for col, v in zip(_COL_LETTERS, values) if v
+        ) + "</row>")
+
+    def close(self) -> None:
+        if self._zf is None:
+            return
+        self._sheet.write(_XLSX_SHEET_TAIL)
+        self._sheet.close()
+        self._zf.close()
+        self._zf = None
+
+class ExcelSink:
+    """
+    Streams rows into the output workbook, one at a time.
+
+    Opened once per run: existing sheet rows (read-only) and any journal left by a crashed
+    run are copied into a temp .xlsx via XlsxStreamWriter, then each append() streams one
+    row to it. close() finishes the zip and atomically replaces the workbook, so the cost
+    of a run is linear in rows written and memory stays flat however big the sheet gets.
+
+    That rewrite only keeps one sheet's values, so it is only used for a workbook this
+    class wrote itself. Any other workbook (extra sheets, formatting, edited in Excel) is
+    updated with a regular openpyxl load/append/save in close() instead, which keeps its
+    sheets and styles at the cost of loading it into memory once.
+
+    Every row is also appended to the journal (<out>.pending.csv) as it arrives, so work
+    is not lost if the run dies before close(); the next ExcelSink picks it up.
     """
-    ensure_excel(path)
-    wb = load_workbook(path)
-    ws = wb.active
 
-    # If someone created a blank workbook manually, fix header.
-    if ws.max_row == 1 and all((ws.cell(1, i+1).value or "") == "" for i in range(len(DEFAULT_COLUMNS))):
-        ws.delete_rows(1, 1)
-        ws.append(DEFAULT_COLUMNS)
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.journal = journal_path(path)
+        self._tmp = self.path.with_name(f"{self.path.stem}.tmp{self.path.suffix}")
+        self._ws: Optional[XlsxStreamWriter] = None
+        self._closed = False
+
+        if self.path.exists() and not self._is_own_workbook(self.path):
+            print(f"  {self.path.name} was not written by WaveSource; rows will be added with openpyxl at the end")
+        elif self.path.exists():
+            src = load_workbook(str(self.path), read_only=True)
+            try:
+                src_ws = src.active
+                self._ws = XlsxStreamWriter(str(self._tmp), sheet_title=src_ws.title)
+                existing = src_ws.iter_rows(values_only=True)
+                first = next(existing, None)
+                # If someone created a blank workbook manually, fix header.
+                if first is None or all((v or "") == "" for v in first):
+                    self._ws.append(DEFAULT_COLUMNS)
+                else:
+                    self._ws.append(list(first))
+                for vals in existing:
+                    self._ws.append(vals)
+            finally:
+                src.close()
+        else:
+            self._ws = XlsxStreamWriter(str(self._tmp))
+            self._ws.append(DEFAULT_COLUMNS)
+
+        if self._ws is not None and self.journal.exists():
+            with open(self.journal, newline="", encoding="utf-8") as f:
+                for rec in csv.reader(f):
+                    self._ws.append(rec)
+
+        # Recovered rows stay in the journal until the workbook is safely replaced.
+        self._journal_fh = open(self.journal, "a", newline="", encoding="utf-8")
+        self._journal_w = csv.writer(self._journal_fh)
 
-    for r in rows:
-        d = asdict(r)
-        ws.append([d.get(col, "") for col in DEFAULT_COLUMNS])
+    @staticmethod
+    def _is_own_workbook(path: Path) -> bool:
+        try:
+            with zipfile.ZipFile(path) as zf:
+                return set(zf.namelist()) == _XLSX_OWN_PARTS
+        except (OSError, zipfile.BadZipFile):
+            return False
+
+    def append(self, row: Row) -> None:
+        vals = _COL_GETTER(row)
+        if self._ws is not None:
+            self._ws.append_text(vals)
+        self._journal_w.writerow(vals)
+        self._journal_fh.flush()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._journal_fh.close()
+        if self._ws is not None:
+            self._ws.close()
+            os.replace(self._tmp, self.path)
+        else:
+            self._merge_journal_with_openpyxl()
+        self.journal.unlink()
+
+    def _merge_journal_with_openpyxl(self) -> None:
+        wb = load_workbook(str(self.path))
+        ws = wb.active
+        # If someone created a blank workbook manually, fix header.
+        if ws.max_row == 1 and all((c.value or "") == "" for c in ws[1]):
+            for i, name in enumerate(DEFAULT_COLUMNS, 1):
+                ws.cell(row=1, column=i, value=name)
+        with open(self.journal, newline="", encoding="utf-8") as f:
+            for rec in csv.reader(f):
+                ws.append(rec)
+        wb.save(str(self._tmp))
+        os.replace(self._tmp, self.path)
 
-    wb.save(path)
+    def __enter__(self) -> "ExcelSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
 
 # ---------------------------
 # NOAA allow-lists + region map
 # ---------------------------
-def _fetch_json(url: str, timeout: int = 30, retries: int = 4, backoff: float = 1.7) -> dict:
-    last_err: Optional[Exception] = None
-    for i in range(retries):
-        try:
-            r = requests.get(url, timeout=timeout)
-            r.raise_for_status()
-            return r.json()
-        except Exception as e:
-            last_err = e
-            time.sleep(backoff ** i)
-    raise RuntimeError(f"Failed to fetch JSON after {retries} tries: {url} :: {last_err}")
+def _make_http_session() -> requests.Session:
+    """
+    One pooled session for NOAA/IOC: keep-alive across the paginated NOAA calls,
+    and urllib3 handles retry/backoff (including Retry-After on 429).
+    """
+    retry = Retry(
+        total=4,
+        backoff_factor=1.7,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"GET"}),
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+    session.headers["User-Agent"] = "WaveSource/1.0"
+    return session
 
-def fetch_noaa_lists() -> Tuple[Set[str], Set[str], Set[str], Dict[str, str]]:
+_SESSION = _make_http_session()
+
+def _fetch_json(url: str, timeout: int = 30) -> dict:
+    try:
+        r = _SESSION.get(url, timeout=timeout)
+        r.raise_for_status()
+        return r.json()
+    except Exception as e:
+        raise RuntimeError(f"Failed to fetch JSON: {url} :: {e}")
+
+def _cached_json(con: Optional[sqlite3.Connection], url: str, ttl: int = REFDATA_TTL_S, refresh: bool = False) -> dict:
+    """
+    _fetch_json behind the sqlite refdata cache (url -> JSON body, ETag).
+    Entries younger than ttl are used as-is; older ones are revalidated with If-None-Match,
+    and a 304 just renews the entry. If revalidation fails (e.g. offline), the stale entry
+    is used with a warning. con=None (cache unavailable) just fetches.
+    """
+    if con is None:
+        return _fetch_json(url)
+    hit = None if refresh else con.execute("SELECT fetched_at, body, etag FROM cache WHERE url = ?", (url,)).fetchone()
+    if hit and time.time() - hit[0] < ttl:
+        return json.loads(hit[1])
+
+    headers = {"If-None-Match": hit[2]} if hit and hit[2] else {}
+    try:
+        r = _SESSION.get(url, headers=headers, timeout=30)
+        if r.status_code == 304 and hit:
+            con.execute("UPDATE cache SET fetched_at = ? WHERE url = ?", (int(time.time()), url))
+            con.commit()
+            return json.loads(hit[1])
+        r.raise_for_status()
+        data = r.json()
+    except Exception as e:
+        if hit:
+            print(f"  WARN: could not revalidate {url} ({e}); using cached copy")
+            return json.loads(hit[1])
+        raise RuntimeError(f"Failed to fetch JSON: {url} :: {e}")
+
+    con.execute(
+        "INSERT OR REPLACE INTO cache (url, fetched_at, body, etag) VALUES (?, ?, ?, ?)",
+        (url, int(time.time()), json.dumps(data).encode("utf-8"), r.headers.get("ETag")),
+    )
+    con.commit()
+    return data
+
+def _open_refdata_cache(path: Path) -> Optional[sqlite3.Connection]:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        con = sqlite3.connect(str(path))
+        con.execute("CREATE TABLE IF NOT EXISTS cache (url TEXT PRIMARY KEY, fetched_at INTEGER, body BLOB, etag TEXT)")
+        if "etag" not in {c[1] for c in con.execute("PRAGMA table_info(cache)")}:
+            con.execute("ALTER TABLE cache ADD COLUMN etag TEXT")  # cache made by an older version
+        return con
+    except (OSError, sqlite3.Error) as e:
+        print(f"  refdata cache unavailable ({e}); fetching without cache")
+        return None
+
+@lru_cache(maxsize=None)
+def fetch_noaa_lists(refresh: bool = False, cache_db: Path = REFDATA_CACHE_PATH) -> Tuple[FrozenSet[str], FrozenSet[str], FrozenSet[str], Dict[str, str]]:
     """
     Returns:
       countries_set, states_set, locations_set, regions_map(code->description)
+
+    Responses are cached in cache_db for REFDATA_TTL_S, then revalidated by ETag;
+    refresh=True ignores the cache. Memoized per process.
     """
-    countries_j = _fetch_json(NOAA_COUNTRIES_URL)
-    states_j    = _fetch_json(NOAA_STATES_URL)
-    regions_j   = _fetch_json(NOAA_REGIONS_URL)
+    con = _open_refdata_cache(cache_db)
+    try:
+        return _fetch_noaa_lists(con, refresh)
+    finally:
+        if con is not None:
+            con.close()
+
+def _fetch_noaa_lists(con: Optional[sqlite3.Connection], refresh: bool) -> Tuple[FrozenSet[str], FrozenSet[str], FrozenSet[str], Dict[str, str]]:
+    def _get(url: str) -> dict:
+        return _cached_json(con, url, refresh=refresh)
 
-    countries = {_upper(x["description"]) for x in countries_j.get("items", [])}
-    states    = {_upper(x["description"]) for x in states_j.get("items", [])}
+    countries_j = _get(NOAA_COUNTRIES_URL)
+    states_j    = _get(NOAA_STATES_URL)
+    regions_j   = _get(NOAA_REGIONS_URL)
+
+    countries = frozenset(_upper(x["description"]) for x in countries_j.get("items", []))
+    states    = frozenset(_upper(x["description"]) for x in states_j.get("items", []))
     regions   = {str(x["id"]).strip(): str(x["description"]).strip() for x in regions_j.get("items", [])}
 
     # Locations are paginated; don’t assume how many pages.
-    page1 = _fetch_json(NOAA_LOCATIONS_URL.format(page=1))
+    page1 = _get(NOAA_LOCATIONS_URL.format(page=1))
     total_pages = int(page1.get("totalPages", 1))
     locations: Set[str] = {_upper(x["description"]) for x in page1.get("items", [])}
     for p in range(2, total_pages + 1):
-        jp = _fetch_json(NOAA_LOCATIONS_URL.format(page=p))
+        jp = _get(NOAA_LOCATIONS_URL.format(page=p))
         locations |= {_upper(x["description"]) for x in jp.get("items", [])}
 
-    return countries, states, locations, regions
+    return countries, states, frozenset(locations), regions
 
-def validate_against_allow_list(value: str, allow: Set[str]) -> Tuple[str, bool]:
+def validate_against_allow_list(value: str, allow: FrozenSet[str]) -> Tuple[str, bool]:
     """
     Returns (kept_value, needs_review).
     - If exact upper-case match exists => returns normalized UPPER value, needs_review=False
     - Else keep OCR text as-is (no guessing), needs_review=True
     """
-    if not value or not value.strip():
+    s = value.strip() if value else ""
+    if not s:
         return "", True
-    v = _upper(value)
-    if v in allow:
-        return v, False
-    return value.strip(), True
+    v = s.upper()
+    return (v, False) if v in allow else (s, True)
 
 def parse_region_code_strict(ocr_text: str, regions_map: Dict[str, str]) -> Tuple[str, bool]:
     """
@@ -275,41 +642,125 @@ def parse_region_code_strict(ocr_text: str, regions_map: Dict[str, str]) -> Tupl
 # ---------------------------
 # IOC station code index (LOCATION_SHORT)
 # ---------------------------
-def fetch_ioc_station_index(timeout: int = 30, cache_path: Optional[Path] = None) -> Dict[Tuple[str, str], str]:
-    """
-    Scrape IOC list.php to build:
-      (COUNTRY_UPPER, LOCATION_UPPER) -> IOC_CODE
+def _is_ioc_header(headers: List[str]) -> bool:
+    header_text = " ".join(headers)
+    return "CODE" in header_text and "COUNTRY" in header_text and "LOCATION" in header_text
 
-    If cache_path is set, store/read IOC HTML so repeated runs are reproducible and faster.
+def _ioc_table_rows(html: str) -> Tuple[List[str], List[List[str]]]:
     """
-    html: str
-    if cache_path and cache_path.exists():
-        html = cache_path.read_text(encoding="utf-8", errors="ignore")
-    else:
-        r = requests.get(IOC_LIST_URL, timeout=timeout)
-        r.raise_for_status()
-        html = r.text
-        if cache_path:
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
-            cache_path.write_text(html, encoding="utf-8")
+    Find the station table (header mentions CODE/COUNTRY/LOCATION) and return
+    (UPPER headers, cell texts per <tr>). Uses lxml + XPath when installed, else bs4.
+    Both join text nodes with a space and collapse whitespace, so they build the same keys.
+    ([], []) if no such table.
+    """
+    if LH is not None:
+        def _text(el) -> str:
+            return " ".join(" ".join(el.itertext()).split())
 
-    soup = BeautifulSoup(html, "html.parser")
+        doc = LH.fromstring(html)
+        for t in doc.xpath("//table[.//th]"):
+            headers = [_upper(_text(th)) for th in t.xpath(".//th")]
+            if _is_ioc_header(headers):
+                return headers, [[_text(td) for td in tr.xpath("./td")] for tr in t.xpath(".//tr")]
+        return [], []
 
-    tables = soup.find_all("table")
-    target = None
-    headers: List[str] = []
+    def _soup_text(el) -> str:
+        return " ".join(el.get_text(" ").split())
 
-    for t in tables:
+    soup = BeautifulSoup(html, "html.parser")
+    for t in soup.find_all("table"):
         ths = t.find_all("th")
         if not ths:
             continue
-        header_text = " ".join(_upper(th.get_text(" ", strip=True)) for th in ths)
-        if "CODE" in header_text and "COUNTRY" in header_text and "LOCATION" in header_text:
-            target = t
-            headers = [_upper(th.get_text(" ", strip=True)) for th in ths]
-            break
+        headers = [_upper(_soup_text(th)) for th in ths]
+        if _is_ioc_header(headers):
+            return headers, [[_soup_text(td) for td in tr.find_all("td")] for tr in t.find_all("tr")]
+    return [], []
+
+def _download_ioc_html(cache_path: Optional[Path], timeout: int, headers: Dict[str, str]) -> Optional[str]:
+    """
+    GET the IOC list (conditionally, if headers say so). Returns None on 304, else the HTML,
+    which is also written to cache_path along with its ETag (<cache_path>.etag).
+    """
+    r = _SESSION.get(IOC_LIST_URL, headers=headers, timeout=timeout)
+    if r.status_code == 304:
+        return None
+    r.raise_for_status()
+    html = r.text
+    if cache_path:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(html, encoding="utf-8")
+        etag = r.headers.get("ETag")
+        etag_path = cache_path.with_name(cache_path.name + ".etag")
+        if etag:
+            etag_path.write_text(etag, encoding="utf-8")
+        elif etag_path.exists():
+            etag_path.unlink()
+    return html
+
+def _revalidate_ioc_html(cache_path: Path, index_path: Path, timeout: int) -> Optional[str]:
+    """
+    Conditional GET for a cached IOC page older than REFDATA_TTL_S. Returns the new HTML,
+    or None if unchanged (the cache files are touched so the TTL starts over) or if the
+    request failed (stale cache used with a warning; retried next run).
+    """
+    etag_path = cache_path.with_name(cache_path.name + ".etag")
+    if etag_path.exists():
+        headers = {"If-None-Match": etag_path.read_text(encoding="utf-8").strip()}
+    else:
+        headers = {"If-Modified-Since": formatdate(cache_path.stat().st_mtime, usegmt=True)}
+    try:
+        html = _download_ioc_html(cache_path, timeout, headers)
+    except Exception as e:
+        print(f"  WARN: could not revalidate IOC list ({e}); using cached copy")
+        return None
+    if html is None:
+        index_ok = index_path.exists() and index_path.stat().st_mtime >= cache_path.stat().st_mtime
+        now = time.time()
+        os.utime(cache_path, (now, now))
+        if index_ok:
+            os.utime(index_path, (now, now))
+    return html
+
+@lru_cache(maxsize=None)
+def fetch_ioc_station_index(
+    timeout: int = 30, cache_path: Optional[Path] = None, refresh: bool = False,
+) -> Tuple[Dict[Tuple[str, str], str], Dict[str, List[Tuple[str, str]]]]:
+    """
+    Scrape IOC list.php to build:
+      index:  (COUNTRY_UPPER, LOCATION_UPPER) -> IOC_CODE
+      by_loc: LOCATION_UPPER -> [(COUNTRY_UPPER, IOC_CODE), ...]
 
-    if target is None:
+    If cache_path is set, store/read IOC HTML so repeated runs are reproducible and faster,
+    plus the parsed index next to it (<cache_path>.index.pkl) so warm runs skip parsing too.
+    After REFDATA_TTL_S the cached page is revalidated (ETag / If-Modified-Since).
+    refresh=True re-downloads and rebuilds both. Memoized per process.
+    """
+    index_path = cache_path.with_name(cache_path.name + ".index.pkl") if cache_path else None
+    html: Optional[str] = None
+    if cache_path and cache_path.exists() and not refresh and time.time() - cache_path.stat().st_mtime >= REFDATA_TTL_S:
+        html = _revalidate_ioc_html(cache_path, index_path, timeout)
+
+    if (
+        html is None and not refresh and index_path and index_path.exists()
+        and (not cache_path.exists() or index_path.stat().st_mtime >= cache_path.stat().st_mtime)
+    ):
+        try:
+            with open(index_path, "rb") as f:
+                cached = pickle.load(f)
+            if isinstance(cached, tuple) and len(cached) == 3 and cached[0] == _IOC_INDEX_FORMAT:
+                return cached[1], cached[2]
+        except Exception:
+            pass  # unreadable/stale pickle: rebuild below
+
+    if html is None:
+        if cache_path and cache_path.exists() and not refresh:
+            html = cache_path.read_text(encoding="utf-8", errors="ignore")
+        else:
+            html = _download_ioc_html(cache_path, timeout, {})
+
+    headers, rows = _ioc_table_rows(html)
+    if not headers:
         raise RuntimeError("Could not find IOC station list table. IOC page markup may have changed.")
 
     def idx(name: str) -> int:
@@ -326,123 +777,224 @@ def fetch_ioc_station_index(timeout: int = 30, cache_path: Optional[Path] = None
     i_location = idx("LOCATION")
 
     index: Dict[Tuple[str, str], str] = {}
-    for tr in target.find_all("tr"):
-        tds = tr.find_all("td")
+    by_loc: Dict[str, List[Tuple[str, str]]] = {}
+    for tds in rows:
         if not tds or len(tds) <= max(i_code, i_country, i_location):
             continue
 
-        code = tds[i_code].get_text(" ", strip=True).strip()
-        country = tds[i_country].get_text(" ", strip=True).strip()
-        location = tds[i_location].get_text(" ", strip=True).strip()
+        code = tds[i_code]
+        country = tds[i_country]
+        location = tds[i_location]
 
         if not code:
             continue
         key = (_upper(country), _upper(location))
         if key not in index:
             index[key] = code
+            by_loc.setdefault(key[1], []).append((key[0], code))
+
+    if index_path:
+        tmp = index_path.with_name(index_path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump((_IOC_INDEX_FORMAT, index, by_loc), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, index_path)
 
-    return index
+    return index, by_loc
 
-def resolve_location_short_strict(country: str, location: str, ioc_index: Dict[Tuple[str, str], str]) -> Tuple[str, bool]:
-    if not ioc_index or not country or not location:
+def resolve_location_short_strict(
+    country_u: str,
+    location_u: str,
+    ioc_index: Dict[Tuple[str, str], str],
+    ioc_by_loc: Optional[Dict[str, List[Tuple[str, str]]]] = None,
+) -> Tuple[str, bool]:
+    """
+    country_u / location_u must already be upper-cased (done once per row by the caller).
+    1) exact (COUNTRY, LOCATION) match -> code, needs_review=False
+    2) else, if exactly one IOC station has that LOCATION -> code, needs_review=True
+       (country didn't match, so a human should confirm). Only pass ioc_by_loc when the
+       row will be reviewed; without it this stays a strict exact match.
+    """
+    if not ioc_index or not location_u:
         return "", True
-    code = ioc_index.get((_upper(country), _upper(location)), "")
+    code = ioc_index.get((country_u, location_u), "") if country_u else ""
     if code and IOC_CODE_RE.match(code):
         return code, False
+
+    candidates = ioc_by_loc.get(location_u, []) if ioc_by_loc else []
+    if len(candidates) == 1 and IOC_CODE_RE.match(candidates[0][1]):
+        return candidates[0][1], True
     return "", True
 
 
 # ---------------------------
 # OCR pipeline
 # ---------------------------
-def load_image_cv(path: str) -> np.ndarray:
-    img = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)
-    if img is None:
-        raise RuntimeError(f"Failed to read image: {path}")
-    return img
-
-def preprocess_variants(img: np.ndarray) -> List[np.ndarray]:
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    out: List[np.ndarray] = []
+_TURBOJPEG: object = None  # per-process handle; False once it failed to load
 
-    # Otsu
-    _, th = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    out.append(th)
-
-    # Inverted Otsu (sometimes labels pop better)
-    _, th_inv = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
-    out.append(th_inv)
+def _turbojpeg() -> Optional[object]:
+    """TurboJPEG handle, or None if PyTurboJPEG / libturbojpeg isn't available."""
+    global _TURBOJPEG
+    if _TURBOJPEG is None and TurboJPEG is not None:
+        try:
+            _TURBOJPEG = TurboJPEG()
+        except Exception:
+            _TURBOJPEG = False  # python package present but shared library missing
+    return _TURBOJPEG or None
 
-    # Adaptive threshold
-    ad = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 35, 11)
-    out.append(ad)
+def _jpeg_exif_orientation(data: bytes) -> int:
+    """EXIF Orientation tag (1-8) of a JPEG, from its APP1 segment; 1 if absent/unreadable."""
+    try:
+        pos = 2  # after SOI
+        while pos + 4 <= len(data) and data[pos] == 0xFF:
+            marker = data[pos + 1]
+            if marker in (0xD9, 0xDA):  # EOI / start of scan: no more metadata
+                break
+            seg_len = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+            if marker == 0xE1 and data[pos + 4:pos + 10] == b"Exif\0\0":
+                tiff = pos + 10
+                end = ">" if data[tiff:tiff + 2] == b"MM" else "<"
+                ifd = tiff + struct.unpack(end + "I", data[tiff + 4:tiff + 8])[0]
+                (count,) = struct.unpack(end + "H", data[ifd:ifd + 2])
+                for k in range(count):
+                    entry = ifd + 2 + 12 * k
+                    tag, _, _, value = struct.unpack(end + "HHIH", data[entry:entry + 10])
+                    if tag == 0x0112:
+                        return value if 1 <= value <= 8 else 1
+                return 1
+            pos += 2 + seg_len
+    except struct.error:
+        pass
+    return 1
 
-    # CLAHE -> Otsu
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(gray)
-    _, th2 = cv2.threshold(clahe, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    out.append(th2)
+def load_image_cv_bytes(data: bytes, name: str = "") -> np.ndarray:
+    """
+    Decode encoded image bytes straight to 8-bit grayscale (everything downstream is
+    grayscale), which skips building a BGR image just to convert it back.
+    `name` is only used for its extension and in error messages.
+    TurboJPEG ignores EXIF orientation while cv2.imdecode applies it, so rotated JPEGs
+    always go through cv2 to get the same pixels either way.
+    """
+    img = None
+    if Path(name).suffix.lower() in {".jpg", ".jpeg"} and _jpeg_exif_orientation(data) == 1:
+        tj = _turbojpeg()
+        if tj is not None:
+            try:
+                img = tj.decode(data, pixel_format=TJPF_GRAY)[:, :, 0]
+            except Exception:
+                img = None
+    if img is None:
+        img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        raise RuntimeError(f"Failed to read image: {name}")
+    return img
 
+def load_image_cv(path: str) -> np.ndarray:
+    return load_image_cv_bytes(Path(path).read_bytes(), path)
+
+# Built once per process; createCLAHE is not free and the settings never change.
+_CLAHE = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+
+def clamp_long_edge(img: np.ndarray, max_long_edge: int) -> np.ndarray:
+    h, w = img.shape[:2]
+    if max_long_edge <= 0 or max(h, w) <= max_long_edge:
+        return img
+    s = max_long_edge / max(h, w)
+    return cv2.resize(img, (max(1, int(w * s)), max(1, int(h * s))), interpolation=cv2.INTER_AREA)
+
+def to_ocr_gray(img: np.ndarray, max_long_edge: int = MAX_LONG_EDGE) -> np.ndarray:
+    gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    return clamp_long_edge(gray, max_long_edge)
+
+def _otsu(gray: np.ndarray, inv: bool = False) -> np.ndarray:
+    flags = (cv2.THRESH_BINARY_INV if inv else cv2.THRESH_BINARY) + cv2.THRESH_OTSU
+    return cv2.threshold(gray, 0, 255, flags)[1]
+
+# (name, builder) in default order: cheapest / usually best first.
+_VARIANTS: Tuple[Tuple[str, Callable[[np.ndarray], np.ndarray]], ...] = (
+    ("otsu", _otsu),
+    ("clahe_otsu", lambda g: _otsu(_CLAHE.apply(g))),
+    ("adaptive", lambda g: cv2.adaptiveThreshold(g, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 35, 11)),
+    # Inverted Otsu (sometimes labels pop better)
+    ("otsu_inv", lambda g: _otsu(g, inv=True)),
     # Light blur -> Otsu (helps with speckle)
-    blur = cv2.GaussianBlur(gray, (3, 3), 0)
-    _, th3 = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    out.append(th3)
+    ("blur_otsu", lambda g: _otsu(cv2.GaussianBlur(g, (3, 3), 0))),
+)
+# Per-process win counts; a batch from one microfilm tends to favour the same variant.
+_VARIANT_WINS: Dict[str, int] = {name: 0 for name, _ in _VARIANTS}
 
-    return out
+def preprocess_variants(gray: np.ndarray) -> Iterator[Tuple[str, np.ndarray]]:
+    """
+    Yield (name, variant) for a grayscale image (see to_ocr_gray) lazily, so the caller
+    can stop early without paying for the rest. Variants that have won most often in
+    this process come first; ties keep the default order.
+    """
+    for name, build_variant in sorted(_VARIANTS, key=lambda nv: -_VARIANT_WINS[nv[0]]):
+        yield name, build_variant(gray)
 
 def _ocr_avg_conf(pil_img: Image.Image, config: str) -> float:
     """
-    Compute an average confidence score from Tesseract's image_to_data output.
+    pytesseract fallback: average word confidence from image_to_data.
     Returns 0.0 if confidence is unavailable.
     """
-    confs: List[float] = []
-
-    # Try DATAFRAME first
-    try:
-        df = pytesseract.image_to_data(
-            pil_img,
-            config=config,
-            output_type=pytesseract.Output.DATAFRAME
-        )
-        if "conf" in df.columns:
-            for c in df["conf"].tolist():
-                try:
-                    cf = float(c)
-                    # Tesseract uses -1 for "not a word"
-                    if cf >= 0:
-                        confs.append(cf)
-                except Exception:
-                    continue
-        return float(np.mean(confs)) if confs else 0.0
-    except Exception:
-        pass
-
-    # Fall back to DICT
     try:
-        d = pytesseract.image_to_data(
-            pil_img,
-            config=config,
-            output_type=pytesseract.Output.DICT
-        )
-        for c in d.get("conf", []):
-            try:
-                cf = float(c)
-                if cf >= 0:
-                    confs.append(cf)
-            except Exception:
-                continue
-        return float(np.mean(confs)) if confs else 0.0
+        d = pytesseract.image_to_data(pil_img, config=config, output_type=pytesseract.Output.DICT)
     except Exception:
         return 0.0
 
+    confs: List[float] = []
+    for c in d.get("conf", []):
+        try:
+            cf = float(c)
+            # Tesseract uses -1 for "not a word"
+            if cf >= 0:
+                confs.append(cf)
+        except Exception:
+            continue
+    return float(np.mean(confs)) if confs else 0.0
+
+
+# One tesserocr handle per (psm, oem), per process. Init loads the traineddata, so reuse it.
+# None is cached too: tesserocr failed to initialise, use pytesseract.
+_TESS_APIS: Dict[Tuple[int, int], Optional[object]] = {}
+
+def _tess_api(psm: int, oem: int) -> Optional[object]:
+    if PyTessBaseAPI is None:
+        return None
+    if (psm, oem) in _TESS_APIS:
+        return _TESS_APIS[(psm, oem)]
+    try:
+        # lang pinned to pytesseract's default so both backends read the same way
+        api = PyTessBaseAPI(lang="eng", psm=psm, oem=oem)
+    except Exception as e:
+        # e.g. bad tessdata path / missing language; raising here would break the pool
+        print(f"  tesserocr init failed ({e}); using pytesseract")
+        _TESS_APIS[(psm, oem)] = None
+        return None
+    _TESS_APIS[(psm, oem)] = api
+    # Pool workers leave via os._exit, which skips atexit; multiprocessing runs
+    # Finalize callbacks with an exitpriority in workers (and at normal exit here).
+    Finalize(None, api.End, exitpriority=10)
+    return api
 
 def ocr_image(img: np.ndarray, psm: int = 6, oem: int = 3) -> Tuple[str, float]:
     """
-    OCR with:
-      - full text from image_to_string (better for your regex parsing)
-      - avg confidence from image_to_data
+    OCR -> (full text, mean confidence 0-100).
+    Uses the in-process tesserocr API when installed (no fork/temp file per call, and the
+    ndarray's pixels are handed over as raw bytes, no PIL image in between),
+    otherwise pytesseract image_to_string + image_to_data.
     """
-    config = f"--psm {psm} --oem {oem}"
+    api = _tess_api(psm, oem)
+    if api is not None:
+        try:
+            h, w = img.shape[:2]
+            bpp = 1 if img.ndim == 2 else img.shape[2]
+            api.SetImageBytes(np.ascontiguousarray(img).tobytes(), w, h, bpp, w * bpp)
+            return api.GetUTF8Text(), float(api.MeanTextConf())
+        except Exception:
+            return "", 0.0
+
     pil_img = Image.fromarray(img)
+    config = f"--psm {psm} --oem {oem}"
 
     # Full OCR text
     try:
@@ -456,14 +1008,35 @@ def ocr_image(img: np.ndarray, psm: int = 6, oem: int = 3) -> Tuple[str, float]:
     return text_full, avg_conf
 
 
+# Per-process OCR memo keyed on a pixel digest. Preprocessing variants often collapse to the
+# same binary image on clean scans (e.g. Otsu vs blur->Otsu); those only get OCR'd once.
+_OCR_CACHE: Dict[Tuple[bytes, int, int], Tuple[str, float]] = {}
+_OCR_CACHE_MAX = 256
+
+def ocr_image_cached(img: np.ndarray, psm: int = 6, oem: int = 3) -> Tuple[str, float]:
+    # blake2b: fastest stdlib hash, and this is not a security use
+    h = hashlib.blake2b(np.ascontiguousarray(img).data, digest_size=16)
+    h.update(repr(img.shape).encode("ascii"))
+    key = (h.digest(), psm, oem)
+
+    hit = _OCR_CACHE.get(key)
+    if hit is not None:
+        return hit
+
+    result = ocr_image(img, psm=psm, oem=oem)
+    if len(_OCR_CACHE) >= _OCR_CACHE_MAX:
+        # dicts keep insertion order: drop the oldest entry
+        del _OCR_CACHE[next(iter(_OCR_CACHE))]
+    _OCR_CACHE[key] = result
+    return result
+
+
 def _anchor_score(text: str) -> int:
     if not text:
         return 0
     t = text.upper()
-    score = 0
-    for pat in OCR_ANCHORS:
-        if re.search(pat, t):
-            score += 1
+    # Each anchor counts once, however often it repeats
+    score = len(set(ANCHOR_RE.findall(t)))
     # Dates/scales are especially useful
     if normalize_date_to_ymd(t):
         score += 2
@@ -471,25 +1044,44 @@ def _anchor_score(text: str) -> int:
         score += 1
     return score
 
-def best_ocr_from_variants(img: np.ndarray, psm: int = 6, oem: int = 3) -> Tuple[str, float, np.ndarray, int]:
+def best_ocr_from_variants(
+    img: np.ndarray, psm: int = 6, oem: int = 3, max_long_edge: int = MAX_LONG_EDGE,
+) -> Tuple[str, float, np.ndarray, int]:
     """
     Pick the OCR result that looks most “structurally right”:
       1) more anchors (COUNTRY/STATE/LOCATION/etc.)
       2) then higher average confidence
       3) then longer text
+    The plain grayscale image is tried first and returned as-is if it already scores
+    MAX_ANCHOR with conf >= FAST_PATH_CONF (common on clean scans).
+    Otherwise stops early once a variant scores MAX_ANCHOR with conf >= EARLY_CONF;
+    the winning variant is counted so later images try it first.
     """
+    gray = to_ocr_gray(img, max_long_edge)
+
+    text, conf = ocr_image_cached(gray, psm=psm, oem=oem)
+    anc = _anchor_score(text)
+    if anc >= MAX_ANCHOR and conf >= FAST_PATH_CONF:
+        return text, conf, gray, anc
+
     best_text = ""
     best_conf = -1.0
-    best_variant = img
+    best_variant = gray
     best_anchor = -1
+    best_name = ""
 
-    for var in preprocess_variants(img):
-        text, conf = ocr_image(var, psm=psm, oem=oem)
+    for name, var in preprocess_variants(gray):
+        text, conf = ocr_image_cached(var, psm=psm, oem=oem)
         anc = _anchor_score(text)
 
         if (anc > best_anchor) or (anc == best_anchor and (conf > best_conf)) or (anc == best_anchor and conf == best_conf and len(text) > len(best_text)):
-            best_text, best_conf, best_variant, best_anchor = text, conf, var, anc
+            best_text, best_conf, best_variant, best_anchor, best_name = text, conf, var, anc, name
+
+        if best_anchor >= MAX_ANCHOR and best_conf >= EARLY_CONF:
+            break
 
+    if best_name:
+        _VARIANT_WINS[best_name] += 1
     return best_text, best_conf, best_variant, best_anchor
 
 
@@ -499,18 +1091,36 @@ def best_ocr_from_variants(img: np.ndarray, psm: int = 6, oem: int = 3) -> Tuple
 def _looks_like_text(s: str) -> bool:
     if not s:
         return False
-    # reject strings that are mostly digits/punct
-    letters = sum(ch.isalpha() for ch in s)
-    return letters >= 2
+    # reject strings that are mostly digits/punct; stop as soon as 2 letters are seen
+    letters = 0
+    for ch in s:
+        if ch.isalpha():
+            letters += 1
+            if letters >= 2:
+                return True
+    return False
 
 def parse_country_state_location(lines: List[str]) -> Tuple[str, str, str]:
-    # A) Uppercase triple with 2+ spaces
-    for line in lines[:20]:
-        m = UPPER_TRIPLE_SPLIT.match(line.strip())
-        if m:
-            return m.group(1).strip(), m.group(2).strip(), m.group(3).strip()
-
-    # B) Semicolon/comma triplets
+    """
+    1) explicit COUNTRY/STATE/LOCATION labels (single pass; wins if all three are present)
+    2) else uppercase triple split on 2+ spaces, then semicolon/comma triplets
+    3) else whatever labels were found
+    """
+    # A) Explicit labels
+    found: Dict[str, str] = {}
+    for m in FIELD_LABEL_RE.finditer("\n".join(lines)):
+        label = m.lastgroup
+        if label not in found:
+            found[label] = m.group(label).strip()
+            if len(found) == 3:
+                return found["COUNTRY"], found["STATE"], found["LOCATION"]
+
+    # B) Uppercase triple with 2+ spaces
+    m = UPPER_TRIPLE_SPLIT_M.search("\n".join(lines[:20]))
+    if m:
+        return m.group(1).strip(), m.group(2).strip(), m.group(3).strip()
+
+    # C) Semicolon/comma triplets
     for line in lines[:30]:
         parts = re.split(r"\s*[;,\t]\s*", line.strip())
         if len(parts) >= 3:
@@ -518,23 +1128,14 @@ def parse_country_state_location(lines: List[str]) -> Tuple[str, str, str]:
             if _looks_like_text(a) and _looks_like_text(b) and _looks_like_text(c):
                 return a, b, c
 
-    # C) Explicit labels
-    blob = "\n".join(lines[:80])
-    m = re.search(r"COUNTRY[:\-\s]+([A-Z .,'()&/-]+)", blob, re.I)
-    country = m.group(1).strip() if m else ""
-    m = re.search(r"STATE[:\-\s]+([A-Z0-9 .,'()&/-]+)", blob, re.I)
-    state = m.group(1).strip() if m else ""
-    m = re.search(r"LOCATION[:\-\s]+([A-Z0-9 .,'()&/-]+)", blob, re.I)
-    location = m.group(1).strip() if m else ""
-    return country, state, location
+    return found.get("COUNTRY", ""), found.get("STATE", ""), found.get("LOCATION", "")
 
 def normalize_date_to_ymd(text: str) -> str:
-    for pat in DATE_PATTERNS:
-        m = pat.search(text)
-        if not m:
-            continue
-        gd = {k: (v if v is None else str(v)) for k, v in m.groupdict().items()}
-        if 'mon' in gd and gd['mon']:
+    """First valid date in the text (single DATE_RE scan), as YYYY/MM/DD."""
+    for m in DATE_RE.finditer(text):
+        # keep only the groups of the alternative that matched, minus the _N suffix
+        gd = {k.rsplit("_", 1)[0]: v for k, v in m.groupdict().items() if v is not None}
+        if gd.get('mon'):
             y = gd['y']; d = gd['d'].zfill(2)
             mon = gd['mon'].upper()[:4].replace('.', '')
             mm = MONTH_MAP.get(mon[:4], MONTH_MAP.get(mon[:3], ""))
@@ -557,16 +1158,58 @@ def parse_scale(text: str) -> str:
 # ---------------------------
 # geocoding
 # ---------------------------
-def make_geocoder(enable: bool) -> Optional["RateLimiter"]:
+def _open_geo_cache(path: Path) -> Optional[shelve.Shelf]:
+    """Persistent geocode cache, closed at exit. None if it can't be opened."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        cache = shelve.open(str(path))
+    except Exception as e:
+        print(f"  geocode cache unavailable ({e}); geocoding without cache")
+        return None
+    atexit.register(cache.close)
+    return cache
+
+def make_geocoder(
+    enable: bool, cache_path: Optional[Path] = GEOCODE_CACHE_PATH,
+) -> Optional[Callable[[str], Tuple[str, ...]]]:
+    """
+    Returns geocode(query) -> (lat, lon) strings, or () if Nominatim has no answer.
+    Answers (including "not found") are memoized and stored in cache_path, so the
+    rate limiter only sleeps on real lookups. Errors raise and are not cached.
+    """
     if not enable:
         return None
     if Nominatim is None or RateLimiter is None:
         print("Geocoding requested but geopy is not available. Install geopy or disable --enable-geocode.")
         return None
     geolocator = Nominatim(user_agent="wavesource_marigram_geocoder")
-    return RateLimiter(geolocator.geocode, min_delay_seconds=1.0)
-
-def geocode_latlon(country: str, state: str, location: str, geocode_fn: Optional["RateLimiter"]) -> Tuple[str, str]:
+    lookup = RateLimiter(geolocator.geocode, min_delay_seconds=1.0, swallow_exceptions=False)
+    cache = _open_geo_cache(cache_path) if cache_path else None
+    memo: Dict[str, Tuple[str, ...]] = {}
+
+    def geocode(query: str) -> Tuple[str, ...]:
+        key = query.lower()
+        hit = memo.get(key)
+        if hit is None and cache is not None:
+            hit = cache.get(key)
+        if hit is not None:
+            memo[key] = hit
+            return hit
+        loc = lookup(query)
+        latlon: Tuple[str, ...] = ()
+        if loc and getattr(loc, "latitude", None) is not None and getattr(loc, "longitude", None) is not None:
+            latlon = (f"{float(loc.latitude):.5f}", f"{float(loc.longitude):.5f}")
+        memo[key] = latlon
+        if cache is not None:
+            cache[key] = latlon
+        return latlon
+
+    return geocode
+
+def geocode_latlon(
+    country: str, state: str, location: str, geocode_fn: Optional[Callable[[str], Tuple[str, ...]]],
+) -> Tuple[str, str]:
+    """Try progressively coarser queries (see make_geocoder for caching)."""
     if geocode_fn is None:
         return "", ""
     queries: List[str] = []
@@ -581,11 +1224,11 @@ def geocode_latlon(country: str, state: str, location: str, geocode_fn: Optional
 
     for q in queries:
         try:
-            loc = geocode_fn(q)
-            if loc and getattr(loc, "latitude", None) is not None and getattr(loc, "longitude", None) is not None:
-                return f"{float(loc.latitude):.5f}", f"{float(loc.longitude):.5f}"
+            latlon = geocode_fn(q)
         except Exception:
-            continue
+            continue  # transient failure: try the coarser query
+        if latlon:
+            return latlon
     return "", ""
 
 
@@ -593,8 +1236,11 @@ def geocode_latlon(country: str, state: str, location: str, geocode_fn: Optional
 # Google Drive helpers (with retries)
 # ---------------------------
 SCOPES = ["https://www.googleapis.com/auth/drive.readonly"]
+# Media chunk per request. googleapiclient's default is 100 MiB, i.e. one buffer the
+# size of the whole scan; 8 MiB keeps each download's buffer small.
+DRIVE_CHUNK_SIZE = 8 << 20
 
-def drive_service() -> object:
+def drive_credentials() -> Credentials:
     creds: Optional[Credentials] = None
     token_path = Path("token.json")
     cred_path = Path("credentials.json")
@@ -611,7 +1257,37 @@ def drive_service() -> object:
             creds = flow.run_local_server(port=0)
         token_path.write_text(creds.to_json(), encoding="utf-8")
 
-    return build("drive", "v3", credentials=creds)
+    return creds
+
+# httplib2.Http is not thread-safe, so each thread keeps one long-lived AuthorizedHttp
+# (its keep-alive connection is reused for every call that thread makes).
+_DRIVE_TLS = threading.local()
+_DRIVE_SVC: Optional[object] = None
+_DRIVE_SVC_LOCK = threading.Lock()
+
+def _thread_http(creds: Credentials) -> AuthorizedHttp:
+    http = getattr(_DRIVE_TLS, "http", None)
+    if http is None:
+        http = AuthorizedHttp(creds, http=httplib2.Http(timeout=120))
+        _DRIVE_TLS.http = http
+    return http
+
+def drive_service(creds: Optional[Credentials] = None) -> object:
+    """
+    One Drive service per process (discovery doc parsed once). Its own http belongs to
+    the thread that built it; other threads pass theirs per request (see _drive_request).
+    """
+    global _DRIVE_SVC
+    with _DRIVE_SVC_LOCK:
+        if _DRIVE_SVC is None:
+            _DRIVE_SVC = build("drive", "v3", http=_thread_http(creds or drive_credentials()), cache_discovery=False)
+        return _DRIVE_SVC
+
+def _drive_request(request: object, http: Optional[AuthorizedHttp]) -> object:
+    """Point a Drive HttpRequest at the calling thread's connection."""
+    if http is not None:
+        request.http = http
+    return request
 
 def _drive_call_with_retry(fn, retries: int = 5, backoff: float = 1.8):
     last_err: Optional[Exception] = None
@@ -668,30 +1344,169 @@ def drive_get_path_map(svc: object, folder_ids: List[str]) -> Dict[str, str]:
                 out[it_id] = f"{prefix}{name}"
     return out
 
-def drive_download_file(svc: object, file_id: str, dest_path: Path) -> None:
+def drive_download_file(svc: object, file_id: str, dest_path: Path, http: Optional[AuthorizedHttp] = None) -> None:
     dest_path.parent.mkdir(parents=True, exist_ok=True)
 
+    # Download to a temp name so an interrupted run never leaves a truncated "cached" image.
+    # Drive allows duplicate names, so two prefetch threads can share dest_path: key the
+    # temp name by file_id so they never write the same .part file.
+    part_path = dest_path.with_name(f"{dest_path.name}.{file_id}.part")
+
     def _call_download():
-        request = svc.files().get_media(fileId=file_id)
-        with io.FileIO(str(dest_path), "wb") as fh:
-            downloader = MediaIoBaseDownload(fh, request)
+        request = _drive_request(svc.files().get_media(fileId=file_id), http)
+        with io.FileIO(str(part_path), "wb") as fh:
+            downloader = MediaIoBaseDownload(fh, request, chunksize=DRIVE_CHUNK_SIZE)
             done = False
             while not done:
                 _, done = downloader.next_chunk()
         return True
 
     _drive_call_with_retry(_call_download)
+    os.replace(part_path, dest_path)
+
+def drive_download_bytes(svc: object, file_id: str, http: Optional[AuthorizedHttp] = None) -> bytes:
+    """Download a file into memory (no disk round-trip)."""
+    def _call_download():
+        buf = io.BytesIO()
+        request = _drive_request(svc.files().get_media(fileId=file_id), http)
+        downloader = MediaIoBaseDownload(buf, request, chunksize=DRIVE_CHUNK_SIZE)
+        done = False
+        while not done:
+            _, done = downloader.next_chunk()
+        return buf.getvalue()
+
+    return _drive_call_with_retry(_call_download)
+
+def scan_cache_dir(cache_dir: Path) -> Set[str]:
+    """
+    Relative paths ("/"-separated, like Drive rel_paths) of every file under cache_dir,
+    from one os.scandir walk, so the prefetcher does a set lookup instead of a stat per file.
+    """
+    found: Set[str] = set()
+    stack = [(str(cache_dir), "")]
+    while stack:
+        root, prefix = stack.pop()
+        try:
+            entries = os.scandir(root)
+        except OSError:
+            continue  # missing or unreadable: nothing cached there
+        with entries:
+            for e in entries:
+                if e.is_dir(follow_symlinks=False):
+                    stack.append((e.path, f"{prefix}{e.name}/"))
+                else:
+                    found.add(f"{prefix}{e.name}")
+    return found
+
+def prefetch_drive_files(
+    creds: Credentials,
+    items: Iterable[Tuple[int, str, str]],
+    cache_dir: Path,
+    workers: int = 8,
+    keep_downloads: bool = False,
+    queue_size: int = 16,
+) -> Iterator[Tuple[int, str, str, Optional[Path], Optional[bytes], bool, str]]:
+    """
+    Producer/consumer prefetch: a background thread keeps `workers` downloads running and
+    pushes finished files onto a bounded queue (queue_size), independent of how fast the
+    caller consumes, so network time hides behind OCR. Files already in cache_dir are
+    reused; new downloads are kept in memory unless keep_downloads, which saves them.
+
+    Yields (index, file_id, rel_path, local_path, data, downloaded, error) in completion
+    order, with exactly one of local_path / data set on success.
+    downloaded=False means the file was already cached.
+    """
+    cached = scan_cache_dir(cache_dir)
+
+    def _fetch(item: Tuple[int, str, str]) -> Tuple[int, str, str, Optional[Path], Optional[bytes], bool, str]:
+        i, file_id, rel_path = item
+        if rel_path in cached:
+            return i, file_id, rel_path, cache_dir / rel_path, None, False, ""
+        try:
+            svc = drive_service(creds)
+            http = _thread_http(creds)
+            if keep_downloads:
+                local_path = cache_dir / rel_path
+                drive_download_file(svc, file_id, local_path, http=http)
+                return i, file_id, rel_path, local_path, None, True, ""
+            return i, file_id, rel_path, None, drive_download_bytes(svc, file_id, http=http), True, ""
+        except Exception as e:
+            return i, file_id, rel_path, None, None, True, str(e)
+
+    out: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    failure: List[BaseException] = []
+
+    def _put(x: object) -> bool:
+        # Give up if the consumer went away, instead of blocking forever on a full queue
+        while not stop.is_set():
+            try:
+                out.put(x, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _producer() -> None:
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                for res in bounded_map_unordered(ex, _fetch, items, window=workers):
+                    if not _put(res):
+                        return
+        except BaseException as e:
+            failure.append(e)
+        finally:
+            _put(None)  # sentinel: no more files
+
+    producer = threading.Thread(target=_producer, name="drive-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            res = out.get()
+            if res is None:
+                break
+            yield res
+        if failure:
+            raise failure[0]
+    finally:
+        stop.set()
 
 
 # ---------------------------
 # Human-in-the-loop review UI (CLI)
 # ---------------------------
-def prompt_field(label: str, current: str, needs_review: bool, allow_hint: str = "") -> str:
+# Format checks for typed corrections, compiled once (bound fullmatch, called per prompt)
+_REGION_CODE_OK = re.compile(r"\d{2}").fullmatch
+_DECIMAL_OK = re.compile(r"[-+]?\d+(?:\.\d+)?").fullmatch
+_YMD_OK = re.compile(r"\d{4}/\d{2}/\d{2}").fullmatch
+_SCALE_OK = re.compile(r"1:\d+").fullmatch
+
+def prompt_field(
+    label: str,
+    current: str,
+    needs_review: bool,
+    allow_hint: str = "",
+    allow: Optional[FrozenSet[str]] = None,
+    check: Optional[Callable[[str], object]] = None,
+) -> str:
+    """
+    With an allow-list, a typed correction is checked against it (O(1), upper-cased like the
+    list itself) and normalized on a match; with a format check (e.g. _DECIMAL_OK), it must
+    match it. Either way a failing value is kept as typed, with a note.
+    """
     flag = "!!" if needs_review else "  "
     hint = f" ({allow_hint})" if allow_hint else ""
     print(f"{flag} {label}{hint}: {current!r}")
     inp = input("    -> Enter to accept, or type correction: ").strip()
-    return current if inp == "" else inp
+    if inp == "":
+        return current
+    if allow:
+        inp, off_list = validate_against_allow_list(inp, allow)
+        if off_list:
+            print("    (not in allow-list; kept as typed)")
+    if check is not None and not check(inp):
+        print("    (unexpected format; kept as typed)")
+    return inp
 
 def prompt_yes_no(msg: str, default_yes: bool = True) -> bool:
     d = "Y/n" if default_yes else "y/N"
@@ -705,51 +1520,118 @@ def prompt_yes_no(msg: str, default_yes: bool = True) -> bool:
 # Progress log (resume)
 # ---------------------------
 def load_processed_ids(log_path: Path) -> Set[str]:
-    if not log_path.exists():
+    """
+    file_ids whose latest log record has status "ok" (a later error, e.g. a row skipped
+    in --phase review after --phase ocr logged it, makes the file pending again).
+    One read_bytes() sweep, parsed with orjson when installed.
+    """
+    try:
+        data = log_path.read_bytes()
+    except FileNotFoundError:
         return set()
+    loads = orjson.loads if orjson is not None else json.loads
     done: Set[str] = set()
-    for line in log_path.read_text(encoding="utf-8").splitlines():
+    for line in data.splitlines():
         try:
-            obj = json.loads(line)
-            if "file_id" in obj and obj.get("status") == "ok":
+            obj = loads(line)
+            if "file_id" not in obj:
+                continue
+            if obj.get("status") == "ok":
                 done.add(str(obj["file_id"]))
+            else:
+                done.discard(str(obj["file_id"]))
         except Exception:
             continue
     return done
 
-def append_log(log_path: Path, record: dict) -> None:
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(log_path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+def _json_line(record: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+class ProgressLog:
+    """
+    Append-only JSONL progress log, opened once per run. Records are buffered and
+    flushed every flush_every writes (and on close / interpreter exit) instead of
+    opening and closing the file for each image.
+
+    Callers flush() explicitly when a record must be on disk together with output
+    written elsewhere. main() does this for every "ok" record, because ExcelSink
+    journals each row as it is appended; so in practice only error records are
+    batched, and a killed run loses at most flush_every - 1 of those (the files are
+    simply retried on --resume).
+    """
+
+    def __init__(self, log_path: Path, flush_every: int = 25) -> None:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(log_path, "ab", buffering=1 << 16)
+        self._flush_every = max(1, flush_every)
+        self._pending = 0
+        atexit.register(self.close)
+
+    def write(self, record: dict) -> None:
+        self._fh.write(_json_line(record))
+        self._pending += 1
+        if self._pending >= self._flush_every:
+            self._fh.flush()
+            self._pending = 0
+
+    def flush(self) -> None:
+        self._fh.flush()
+        self._pending = 0
+
+    def close(self) -> None:
+        if not self._fh.closed:
+            self._fh.close()
 
 
 # ---------------------------
 # Core processing for one image
 # ---------------------------
+# Audit artifacts (--save-ocr) are written in the background: PNG encoding is CPU-heavy,
+# releases the GIL, and nothing downstream reads the files. Pending writes are joined at
+# interpreter exit (worker processes included) and explicitly at the end of main().
+_IO_POOL = ThreadPoolExecutor(max_workers=2)
+
+def _save_ocr_audit(save_ocr_dir: Path, stem: str, ocr_text: str, best_variant: np.ndarray) -> None:
+    try:
+        (save_ocr_dir / f"{stem}.txt").write_text(ocr_text, encoding="utf-8")
+        # Fast PNG compression: ~3x quicker to encode, slightly bigger files
+        cv2.imwrite(str(save_ocr_dir / f"{stem}_best.png"), best_variant, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+    except Exception as e:
+        print(f"  -> WARN: could not save OCR audit for {stem}: {e}")
+
 def process_one_image(
-    local_path: Path,
+    img: np.ndarray,
     drive_rel_path: str,
-    countries: Set[str],
-    states: Set[str],
-    locations: Set[str],
+    countries: FrozenSet[str],
+    states: FrozenSet[str],
+    locations: FrozenSet[str],
     regions_map: Dict[str, str],
     ioc_index: Dict[Tuple[str, str], str],
-    geocode_fn: Optional["RateLimiter"],
+    ioc_by_loc: Dict[str, List[Tuple[str, str]]],
     save_ocr_dir: Optional[Path],
     microfilm_name: str,
     microfilm_from_folder: bool,
-    interactive: bool,
     psm: int,
     oem: int,
-) -> Row:
-    img = load_image_cv(str(local_path))
-    ocr_text, conf, best_variant, anchor_score = best_ocr_from_variants(img, psm=psm, oem=oem)
+    max_long_edge: int = MAX_LONG_EDGE,
+) -> Tuple[Row, Dict[str, bool], float]:
+    """
+    OCR + parse + validate one decoded image. No prompts and no geocoding here, so it
+    is safe to run inside a worker process.
+
+    Returns (row, review_flags, ocr_scale) where review_flags marks fields that need a
+    human look and ocr_scale is the factor the image was shrunk by for OCR (1.0 if not).
+    """
+    h, w = img.shape[:2]
+    ocr_scale = max_long_edge / max(h, w) if 0 < max_long_edge < max(h, w) else 1.0
+    ocr_text, conf, best_variant, anchor_score = best_ocr_from_variants(img, psm=psm, oem=oem, max_long_edge=max_long_edge)
 
     if save_ocr_dir:
         save_ocr_dir.mkdir(parents=True, exist_ok=True)
-        stem = safe_filename(local_path.stem)
-        (save_ocr_dir / f"{stem}.txt").write_text(ocr_text, encoding="utf-8")
-        cv2.imwrite(str(save_ocr_dir / f"{stem}_best.png"), best_variant)
+        stem = safe_filename(Path(drive_rel_path).stem)
+        _IO_POOL.submit(_save_ocr_audit, save_ocr_dir, stem, ocr_text, best_variant)
 
     text_clean = sanitize_text(ocr_text)
     lines = [ln.strip() for ln in text_clean.splitlines() if ln.strip()]
@@ -768,10 +1650,9 @@ def process_one_image(
     region_code, region_flag = parse_region_code_strict(text_clean, regions_map)
 
     # IOC station code strict (LOCATION_SHORT)
-    location_short, loc_short_flag = resolve_location_short_strict(country, location, ioc_index)
-
-    # Lat/lon (geocode)
-    lat, lon = geocode_latlon(country, state, location, geocode_fn)
+    location_short, loc_short_flag = resolve_location_short_strict(
+        country.upper(), location.upper(), ioc_index, ioc_by_loc,
+    )
 
     # MICROFILM_NAME from folder
     mf_name = microfilm_name
@@ -782,6 +1663,8 @@ def process_one_image(
 
     # Comments: keep it simple and actually useful for auditing
     comments = f"avg_conf={conf:.1f}; anchors={anchor_score}; psm={psm}; oem={oem}; path={drive_rel_path}"
+    if location_short and loc_short_flag:
+        comments += "; LOCATION_SHORT matched by location only (country differs)"
 
     row = Row(
         FILE_NAME=drive_rel_path,
@@ -791,103 +1674,324 @@ def process_one_image(
         LOCATION_SHORT=location_short,
         REGION_CODE=region_code,
         RECORDED_DATE=recorded_date,
-        LATITUDE=lat,
-        LONGITUDE=lon,
         IMAGES="1",
         SCALE=scale,
         MICROFILM_NAME=mf_name,
         COMMENTS=comments,
     )
 
-    # Human-in-the-loop review if interactive
-    if interactive:
-        needs_any_review = any([
-            country_flag, state_flag, location_flag,
-            region_flag, loc_short_flag,
-            (recorded_date == ""), (scale == "")
-        ])
-
-        print("\n" + "="*72)
-        print(f"IMAGE: {drive_rel_path}")
-        print(f"LOCAL: {local_path}")
-        print("-"*72)
-
-        if needs_any_review:
-            print("Some fields need a look. Quick edit mode:\n")
-        else:
-            print("Looks fine. Edit anything you want:\n")
-
-        row.COUNTRY = prompt_field("COUNTRY", row.COUNTRY, country_flag, allow_hint="NOAA allow-list")
-        row.STATE = prompt_field("STATE", row.STATE, state_flag, allow_hint="NOAA allow-list")
-        row.LOCATION = prompt_field("LOCATION", row.LOCATION, location_flag, allow_hint="NOAA allow-list")
-        row.RECORDED_DATE = prompt_field("RECORDED_DATE (YYYY/MM/DD)", row.RECORDED_DATE, row.RECORDED_DATE == "")
-        row.SCALE = prompt_field("SCALE (1:NN)", row.SCALE, row.SCALE == "")
-        row.REGION_CODE = prompt_field("REGION_CODE (NCEI 2-digit)", row.REGION_CODE, region_flag, allow_hint="must exist in NOAA regions")
-        row.LOCATION_SHORT = prompt_field("LOCATION_SHORT (IOC station code)", row.LOCATION_SHORT, loc_short_flag, allow_hint="from IOC list.php")
-        row.LATITUDE = prompt_field("LATITUDE (decimal)", row.LATITUDE, row.LATITUDE == "", allow_hint="geocode")
-        row.LONGITUDE = prompt_field("LONGITUDE (decimal)", row.LONGITUDE, row.LONGITUDE == "", allow_hint="geocode")
-        row.MICROFILM_NAME = prompt_field("MICROFILM_NAME", row.MICROFILM_NAME, row.MICROFILM_NAME == "")
-        row.IMAGES = prompt_field("IMAGES", row.IMAGES, row.IMAGES == "")
-        row.COMMENTS = prompt_field("COMMENTS", row.COMMENTS, False)
-
-        if not prompt_yes_no("Save this row to Excel?", default_yes=True):
-            raise RuntimeError("User skipped row in review mode.")
+    flags = {
+        "COUNTRY": country_flag,
+        "STATE": state_flag,
+        "LOCATION": location_flag,
+        "REGION_CODE": region_flag,
+        "LOCATION_SHORT": loc_short_flag,
+        "RECORDED_DATE": recorded_date == "",
+        "SCALE": scale == "",
+    }
+    return row, flags, ocr_scale
+
+
+def review_row(
+    row: Row,
+    flags: Dict[str, bool],
+    local_path: Optional[Path],
+    countries: FrozenSet[str] = frozenset(),
+    states: FrozenSet[str] = frozenset(),
+    locations: FrozenSet[str] = frozenset(),
+) -> Row:
+    """
+    Human-in-the-loop review of one row (main process only, reads stdin).
+    Corrections to COUNTRY/STATE/LOCATION are re-checked against the NOAA allow-lists.
+    Raises RuntimeError if the user chooses not to save the row.
+    """
+    print("\n" + "="*72)
+    print(f"IMAGE: {row.FILE_NAME}")
+    print(f"LOCAL: {local_path or '(not kept; use --keep-downloads)'}")
+    print("-"*72)
+
+    if any(flags.values()):
+        print("Some fields need a look. Quick edit mode:\n")
+    else:
+        print("Looks fine. Edit anything you want:\n")
+
+    row.COUNTRY = prompt_field("COUNTRY", row.COUNTRY, flags["COUNTRY"], allow_hint="NOAA allow-list", allow=countries)
+    row.STATE = prompt_field("STATE", row.STATE, flags["STATE"], allow_hint="NOAA allow-list", allow=states)
+    row.LOCATION = prompt_field("LOCATION", row.LOCATION, flags["LOCATION"], allow_hint="NOAA allow-list", allow=locations)
+    row.RECORDED_DATE = prompt_field("RECORDED_DATE (YYYY/MM/DD)", row.RECORDED_DATE, row.RECORDED_DATE == "", check=_YMD_OK)
+    row.SCALE = prompt_field("SCALE (1:NN)", row.SCALE, row.SCALE == "", check=_SCALE_OK)
+    row.REGION_CODE = prompt_field("REGION_CODE (NCEI 2-digit)", row.REGION_CODE, flags["REGION_CODE"], allow_hint="must exist in NOAA regions", check=_REGION_CODE_OK)
+    row.LOCATION_SHORT = prompt_field("LOCATION_SHORT (IOC station code)", row.LOCATION_SHORT, flags["LOCATION_SHORT"], allow_hint="from IOC list.php")
+    row.LATITUDE = prompt_field("LATITUDE (decimal)", row.LATITUDE, row.LATITUDE == "", allow_hint="geocode", check=_DECIMAL_OK)
+    row.LONGITUDE = prompt_field("LONGITUDE (decimal)", row.LONGITUDE, row.LONGITUDE == "", allow_hint="geocode", check=_DECIMAL_OK)
+    row.MICROFILM_NAME = prompt_field("MICROFILM_NAME", row.MICROFILM_NAME, row.MICROFILM_NAME == "")
+    row.IMAGES = prompt_field("IMAGES", row.IMAGES, row.IMAGES == "")
+    row.COMMENTS = prompt_field("COMMENTS", row.COMMENTS, False)
+
+    if not prompt_yes_no("Save this row to Excel?", default_yes=True):
+        raise RuntimeError("User skipped row in review mode.")
 
     return row
 
+def _reviewed_offset(marker_path: Path) -> int:
+    """Byte offset into the review queue up to which entries have been reviewed (0 if none)."""
+    offset = 0
+    if marker_path.exists():
+        loads = orjson.loads if orjson is not None else json.loads
+        for line in marker_path.read_bytes().splitlines():
+            try:
+                offset = int(loads(line)["offset"])
+            except (ValueError, KeyError, TypeError):
+                continue  # torn last line of a killed review
+    return offset
+
+def review_queued_rows(
+    queue_path: Path,
+    sink: ExcelSink,
+    progress_log: ProgressLog,
+    cache_dir: Path,
+    countries: FrozenSet[str],
+    states: FrozenSet[str],
+    locations: FrozenSet[str],
+) -> Tuple[int, int]:
+    """
+    --phase review: walk the queue written by --phase ocr, prompt for each row and append
+    the accepted ones to sink. A skipped row is logged as an error, like in --phase both,
+    so --resume OCRs that image again.
+
+    The queue is never rewritten here: an OCR phase may still be appending to it. Progress
+    is recorded as a byte offset in an append-only <queue>.reviewed file after every entry,
+    so an interrupted (even killed) review resumes where it stopped, and rows queued while
+    a review is running are picked up by this run or the next one.
+    Returns (saved, skipped).
+    """
+    if not queue_path.exists():
+        return 0, 0
+    loads = orjson.loads if orjson is not None else json.loads
+    marker_path = queue_path.with_name(queue_path.name + ".reviewed")
+    offset = _reviewed_offset(marker_path)
+    if offset > queue_path.stat().st_size:
+        print(f"  -> NOTE: {queue_path} is shorter than its review marker; reviewing it from the start.")
+        offset = 0
+    saved = skipped = 0
+    with closing(ProgressLog(marker_path, flush_every=1)) as marker:
+        while True:
+            with open(queue_path, "rb") as fh:
+                fh.seek(offset)
+                chunk = fh.read()
+            # Only whole lines: the OCR side may be halfway through writing the last one.
+            end = chunk.rfind(b"\n") + 1
+            if end == 0:
+                break
+            for line in chunk[:end].splitlines(keepends=True):
+                offset += len(line)
+                if not line.strip():
+                    continue
+                rec = loads(line)
+                local_path = cache_dir / rec["rel_path"]
+                try:
+                    row = review_row(
+                        Row(**rec["row"]), rec["flags"], local_path if local_path.exists() else None,
+                        countries, states, locations,
+                    )
+                except RuntimeError as e:
+                    skipped += 1
+                    progress_log.write({"file_id": rec["file_id"], "rel_path": rec["rel_path"], "status": "error", "error": str(e)})
+                    progress_log.flush()
+                else:
+                    sink.append(row)
+                    saved += 1
+                marker.write({"offset": offset, "file_id": rec["file_id"]})
+    return saved, skipped
+
+
+# ---------------------------
+# Worker pool (one single-threaded Tesseract per process)
+# ---------------------------
+# Per-process context, filled once by _init_worker so allow-lists are not re-pickled per task.
+_WORKER_CTX: Dict[str, object] = {}
+
+def _init_worker(
+    countries: FrozenSet[str],
+    states: FrozenSet[str],
+    locations: FrozenSet[str],
+    regions_map: Dict[str, str],
+    ioc_index: Dict[Tuple[str, str], str],
+    ioc_by_loc: Dict[str, List[Tuple[str, str]]],
+    save_ocr_dir: Optional[Path],
+    microfilm_name: str,
+    microfilm_from_folder: bool,
+    psm: int,
+    oem: int,
+    max_long_edge: int,
+) -> None:
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    # Same idea for OpenCV: the pool already provides the parallelism.
+    cv2.setNumThreads(1)
+    # Pay the Tesseract init once per worker, not on the first image.
+    _tess_api(psm, oem)
+    _WORKER_CTX.update(
+        countries=countries,
+        states=states,
+        locations=locations,
+        regions_map=regions_map,
+        ioc_index=ioc_index,
+        ioc_by_loc=ioc_by_loc,
+        save_ocr_dir=save_ocr_dir,
+        microfilm_name=microfilm_name,
+        microfilm_from_folder=microfilm_from_folder,
+        psm=psm,
+        oem=oem,
+        max_long_edge=max_long_edge,
+    )
+
+def _run_job(job: Job) -> Tuple[str, str, Optional[Row], Dict[str, bool], float, str]:
+    """
+    Decode + process one Job inside a worker.
+    Returns (file_id, drive_rel_path, row, review_flags, ocr_scale, error). Errors are returned,
+    not raised, so one bad image doesn't tear down the whole pool.
+    """
+    try:
+        if job.data is not None:
+            img = load_image_cv_bytes(job.data, job.rel_path)
+        else:
+            img = load_image_cv(job.local_path)
+        row, flags, ocr_scale = process_one_image(
+            img=img,
+            drive_rel_path=job.rel_path,
+            **_WORKER_CTX,
+        )
+        return job.file_id, job.rel_path, row, flags, ocr_scale, ""
+    except Exception as e:
+        return job.file_id, job.rel_path, None, {}, 1.0, str(e)
+
+def bounded_map_unordered(ex: Executor, fn: Callable, items: Iterable, window: int) -> Iterator:
+    """
+    Like ex.map, but pulls from `items` lazily and keeps at most `window` tasks in flight.
+    (Executor.map submits everything up front, which would drain a download generator
+    before the first result comes back.) Results are yielded as they complete, so one
+    slow task doesn't hold up the rest.
+    """
+    pending: set = set()
+    for it in items:
+        pending.add(ex.submit(fn, it))
+        if len(pending) >= window:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                yield f.result()
+    for f in as_completed(pending):
+        yield f.result()
+
+def run_ocr_pool(
+    jobs: Iterable[Job],
+    workers: int,
+    init_args: tuple,
+) -> Iterator[Tuple[str, str, Optional[Row], Dict[str, bool], float, str]]:
+    """
+    Yield _run_job results in completion order.
+    workers<=1 runs in-process, in order (easier to debug).
+    """
+    if workers <= 1:
+        _init_worker(*init_args)
+        yield from map(_run_job, jobs)
+        return
+    # Workers must not be forked from this process: by the first submit the Drive prefetch
+    # threads are already mid-I/O, and a fork can inherit their held locks. forkserver
+    # (spawn where unavailable) starts workers from a clean, single-threaded process.
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=init_args) as ex:
+        yield from bounded_map_unordered(ex, _run_job, jobs, window=workers * 2)
+
 
 # ---------------------------
 # Main
 # ---------------------------
 def main() -> None:
     ap = argparse.ArgumentParser(description="Google Drive HITL OCR marigram images -> Excel")
-    ap.add_argument("--folder-ids", nargs="+", required=True, help="One or more Google Drive folder IDs")
+    ap.add_argument("--folder-ids", nargs="+", help="One or more Google Drive folder IDs (not needed for --phase review)")
     ap.add_argument("--out-xlsx", required=True, help="Output Excel path (.xlsx)")
-    ap.add_argument("--cache-dir", default="./_drive_cache", help="Local cache directory for downloaded images")
+    ap.add_argument("--cache-dir", default="./_drive_cache",
+                    help="Local image cache. Images already here are reused; new ones are saved only with --keep-downloads")
+    ap.add_argument("--keep-downloads", action="store_true",
+                    help="Save downloaded images to --cache-dir (default: OCR them from memory; "
+                         "always on with --interactive or --phase ocr, so reviewers can open them)")
     ap.add_argument("--save-ocr", default=None, help="Optional folder to save OCR text + best-preprocessed image")
     ap.add_argument("--resume", action="store_true", help="Resume using progress log (skip already processed files)")
     ap.add_argument("--log-path", default="./_progress/processed.jsonl", help="Progress log path (jsonl)")
     ap.add_argument("--interactive", action="store_true", help="Enable human-in-the-loop review prompts")
+    ap.add_argument("--phase", choices=("ocr", "review", "both"), default="both",
+                    help="ocr: OCR unattended and queue rows for review; review: prompt for queued rows and "
+                         "write them to Excel; both: OCR and write in one run (default)")
+    ap.add_argument("--review-queue", default="./_review/pending.jsonl",
+                    help="Queue of OCR'd rows awaiting review (--phase ocr/review)")
     ap.add_argument("--enable-geocode", action="store_true", help="Enable Nominatim geocoding for lat/lon (rate-limited)")
+    ap.add_argument("--geocode-cache", default=str(GEOCODE_CACHE_PATH),
+                    help="On-disk geocode cache (shelve); empty string disables it")
     ap.add_argument("--microfilm-name", default="", help="Default MICROFILM_NAME (if not using --microfilm-name-from-folder)")
     ap.add_argument("--microfilm-name-from-folder", action="store_true", help="Set MICROFILM_NAME from top-level Drive folder name")
 
     # Quality-of-life for testing and reproducibility
     ap.add_argument("--max-files", type=int, default=0, help="Process at most N images (0 = no limit)")
-    ap.add_argument("--shuffle", action="store_true", help="Shuffle file processing order")
+    ap.add_argument("--shuffle", action="store_true", help="Shuffle file processing order (takes precedence over --sort)")
     ap.add_argument("--sort", action="store_true", help="Sort file processing order by path")
 
     # OCR knobs
     ap.add_argument("--psm", type=int, default=6, help="Tesseract page segmentation mode (default: 6)")
     ap.add_argument("--oem", type=int, default=3, help="Tesseract OCR engine mode (default: 3)")
+    ap.add_argument("--max-long-edge", type=int, default=MAX_LONG_EDGE,
+                    help=f"Downscale images whose long edge exceeds this many pixels before OCR; 0 disables (default: {MAX_LONG_EDGE})")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="OCR worker processes, each running single-threaded Tesseract (default: CPU count)")
+    ap.add_argument("--download-workers", type=int, default=8,
+                    help="Concurrent Drive downloads, prefetched ahead of OCR (default: 8)")
 
     # IOC cache
     ap.add_argument("--ioc-cache-html", default="./_cache/ioc_list.html", help="Where to cache IOC list HTML")
+    ap.add_argument("--refresh-refdata", "--refresh-lists", action="store_true",
+                    help=f"Ignore cached NOAA lists ({REFDATA_CACHE_PATH}) and IOC list, and re-download them")
 
     args = ap.parse_args()
+    if args.phase != "review" and not args.folder_ids:
+        ap.error("--folder-ids is required unless --phase review")
 
     out_xlsx = str(Path(args.out_xlsx))
     cache_dir = Path(args.cache_dir)
     save_ocr_dir = Path(args.save_ocr) if args.save_ocr else None
     log_path = Path(args.log_path)
     ioc_cache_path = Path(args.ioc_cache_html) if args.ioc_cache_html else None
+    review_queue_path = Path(args.review_queue)
 
     # Fetch official lists
     print("Fetching NOAA allow-lists (countries/states/locations/regions)...")
-    countries, states, locations, regions_map = fetch_noaa_lists()
+    countries, states, locations, regions_map = fetch_noaa_lists(refresh=args.refresh_refdata)
     print(f"  countries={len(countries)}, states={len(states)}, locations={len(locations)}, regions={len(regions_map)}")
 
+    # Review phase: no Drive/OCR, just the queue left by --phase ocr.
+    if args.phase == "review":
+        print(f"Reviewing queued rows from {review_queue_path}...")
+        with ExcelSink(out_xlsx) as sink, closing(ProgressLog(log_path)) as progress_log:
+            saved, skipped = review_queued_rows(
+                review_queue_path, sink, progress_log, cache_dir, countries, states, locations,
+            )
+        print("\nDone.")
+        print(f"  SAVED:   {saved}")
+        print(f"  SKIPPED: {skipped}")
+        print(f"Output: {out_xlsx}")
+        return
+
     print("Fetching IOC station list (LOCATION_SHORT codes)...")
     try:
-        ioc_index = fetch_ioc_station_index(cache_path=ioc_cache_path)
+        ioc_index, ioc_by_loc = fetch_ioc_station_index(cache_path=ioc_cache_path, refresh=args.refresh_refdata)
         print(f"  IOC index entries={len(ioc_index)} (cache: {ioc_cache_path})")
     except Exception as e:
         print(f"  IOC fetch failed, continuing without IOC codes: {e}")
-        ioc_index = {}
+        ioc_index, ioc_by_loc = {}, {}
 
-    geocode_fn = make_geocoder(args.enable_geocode)
+    geocode_fn = make_geocoder(args.enable_geocode, Path(args.geocode_cache) if args.geocode_cache else None)
 
-    svc = drive_service()
+    creds = drive_credentials()
+    svc = drive_service(creds)
 
     # Traverse drive folder(s)
     print("Listing files in Drive folders...")
@@ -897,93 +2001,157 @@ def main() -> None:
         print("No images found in provided Drive folders.")
         sys.exit(1)
 
-    if args.sort:
-        image_items.sort(key=lambda x: x[1])
+    ok_count = 0
+    skip_count = 0
+    err_count = 0
+
+    # Drop finished files up front, so the [i/N] counter and --max-files count new work only.
+    if args.resume:
+        processed = load_processed_ids(log_path)
+        print(f"Resume enabled. Already processed: {len(processed)}")
+        found = len(image_items)
+        image_items = [it for it in image_items if it[0] not in processed]
+        skip_count = found - len(image_items)
+        if not image_items:
+            print("Nothing left to process.")
+
+    # --shuffle wins over --sort (a sort followed by a shuffle was always just a shuffle)
     if args.shuffle:
         random.shuffle(image_items)
+    elif args.sort:
+        image_items.sort(key=itemgetter(1))
 
     if args.max_files and args.max_files > 0:
         image_items = image_items[: args.max_files]
 
     print(f"Found {len(image_items)} image files to process.")
 
-    processed: Set[str] = set()
-    if args.resume:
-        processed = load_processed_ids(log_path)
-        print(f"Resume enabled. Already processed: {len(processed)}")
-
-    rows_to_write: List[Row] = []
-    ok_count = 0
-    skip_count = 0
-    err_count = 0
-
     default_microfilm = args.microfilm_name.strip()
     if not default_microfilm and not args.microfilm_name_from_folder:
         default_microfilm = "UNKNOWN"
 
-    # Make sure output exists early (helps if the run dies mid-way)
-    ensure_excel(out_xlsx)
+    # Opened up front: folds in the existing sheet and rows journaled by a run that died mid-way.
+    # The OCR phase writes to the review queue instead (flushed per row: it holds the only copy).
+    sink = ExcelSink(out_xlsx) if args.phase != "ocr" else None
+    review_out = ProgressLog(review_queue_path, flush_every=1) if args.phase == "ocr" else None
+    progress_log = ProgressLog(log_path)
+
+    def _record_error(file_id: str, rel_path: str, err: str) -> None:
+        nonlocal err_count
+        err_count += 1
+        progress_log.write({"file_id": file_id, "rel_path": rel_path, "status": "error", "error": err})
+        print(f"  -> ERROR: {rel_path} :: {err}")
+
+    def _scale_note(ocr_scale: float) -> str:
+        return f" (scaled {ocr_scale:.2f} for OCR)" if ocr_scale < 1.0 else ""
+
+    def _record_ok(file_id: str, rel_path: str, row: Row, ocr_scale: float = 1.0) -> None:
+        nonlocal ok_count
+        sink.append(row)
+        ok_count += 1
+
+        progress_log.write({
+            "file_id": file_id,
+            "rel_path": rel_path,
+            "status": "ok",
+            "psm": args.psm,
+            "oem": args.oem,
+        })
+        # The sink journals each row as it is appended; flush the "ok" record alongside it so a
+        # killed run never resumes with rows in the journal that the log says are still to do.
+        progress_log.flush()
+        print(f"  -> OK: {Path(rel_path).name}{_scale_note(ocr_scale)}")
+
+    def _record_queued(file_id: str, rel_path: str, row: Row, flags: Dict[str, bool], ocr_scale: float) -> None:
+        nonlocal ok_count
+        review_out.write({
+            "file_id": file_id,
+            "rel_path": rel_path,
+            "row": dict(zip(DEFAULT_COLUMNS, _COL_GETTER(row))),
+            "flags": flags,
+        })
+        ok_count += 1
+        # Logged as done: the file's OCR is finished and its row lives in the queue now.
+        progress_log.write({
+            "file_id": file_id,
+            "rel_path": rel_path,
+            "status": "ok",
+            "queued": True,
+            "psm": args.psm,
+            "oem": args.oem,
+        })
+        progress_log.flush()
+        print(f"  -> QUEUED: {Path(rel_path).name}{_scale_note(ocr_scale)}")
+
+    def _wanted() -> Iterator[Tuple[int, str, str]]:
+        for i, (file_id, rel_path) in enumerate(image_items, 1):
+            yield i, file_id, rel_path
+
+    # Rows a human will see: the reviewer needs the image on disk, and only then is the
+    # by-location IOC guess offered.
+    reviewed = args.interactive or args.phase == "ocr"
+
+    # Downloads run a few files ahead on a thread pool; OCR consumes them as they land.
+    def _ready_jobs() -> Iterator[Job]:
+        downloads = prefetch_drive_files(
+            creds, _wanted(), cache_dir,
+            workers=max(1, args.download_workers), keep_downloads=args.keep_downloads or reviewed,
+        )
+        for i, file_id, rel_path, local_path, data, downloaded, err in downloads:
+            if err:
+                _record_error(file_id, rel_path, err)
+                continue
+            print(f"[{i}/{len(image_items)}] {'Downloaded' if downloaded else 'Cached'}: {rel_path}")
+            yield Job(file_id, rel_path, str(local_path) if local_path else None, data)
 
-    for i, (file_id, rel_path) in enumerate(image_items, 1):
-        if args.resume and file_id in processed:
-            skip_count += 1
-            continue
+    init_args = (
+        countries, states, locations, regions_map, ioc_index, ioc_by_loc if reviewed else {}, save_ocr_dir,
+        default_microfilm, args.microfilm_name_from_folder, args.psm, args.oem, args.max_long_edge,
+    )
+    workers = max(1, min(args.workers, len(image_items)))
+    print(f"Running OCR with {workers} worker(s)...")
 
-        try:
-            local_path = cache_dir / rel_path
-            if not local_path.exists():
-                print(f"[{i}/{len(image_items)}] Downloading: {rel_path}")
-                drive_download_file(svc, file_id, local_path)
-            else:
-                print(f"[{i}/{len(image_items)}] Cached: {rel_path}")
-
-            row = process_one_image(
-                local_path=local_path,
-                drive_rel_path=rel_path,
-                countries=countries,
-                states=states,
-                locations=locations,
-                regions_map=regions_map,
-                ioc_index=ioc_index,
-                geocode_fn=geocode_fn,
-                save_ocr_dir=save_ocr_dir,
-                microfilm_name=default_microfilm,
-                microfilm_from_folder=args.microfilm_name_from_folder,
-                interactive=args.interactive,
-                psm=args.psm,
-                oem=args.oem,
-            )
-            rows_to_write.append(row)
-            ok_count += 1
-
-            append_log(log_path, {
-                "file_id": file_id,
-                "rel_path": rel_path,
-                "status": "ok",
-                "psm": args.psm,
-                "oem": args.oem,
-            })
-            print(f"  -> OK: {local_path.name}")
-
-            # Write in batches so work is not lost
-            if len(rows_to_write) >= 25:
-                append_rows_to_excel(out_xlsx, rows_to_write)
-                rows_to_write = []
-                print("  -> wrote batch to Excel")
+    # Prompts can't run inside workers; interactive rows wait here until the pool drains.
+    review_queue: List[Tuple[str, str, Row, Dict[str, bool], float]] = []
 
-        except Exception as e:
-            err_count += 1
-            append_log(log_path, {"file_id": file_id, "rel_path": rel_path, "status": "error", "error": str(e)})
-            print(f"  -> ERROR: {rel_path} :: {e}")
+    try:
+        for file_id, rel_path, row, flags, ocr_scale, err in run_ocr_pool(_ready_jobs(), workers, init_args):
+            if row is None:
+                _record_error(file_id, rel_path, err)
+                continue
 
-    if rows_to_write:
-        append_rows_to_excel(out_xlsx, rows_to_write)
+            # Geocoding stays on the main process so the Nominatim rate limit is global.
+            row.LATITUDE, row.LONGITUDE = geocode_latlon(row.COUNTRY, row.STATE, row.LOCATION, geocode_fn)
+
+            if args.phase == "ocr":
+                _record_queued(file_id, rel_path, row, flags, ocr_scale)
+            elif args.interactive:
+                review_queue.append((file_id, rel_path, row, flags, ocr_scale))
+            else:
+                _record_ok(file_id, rel_path, row, ocr_scale)
+
+        for file_id, rel_path, row, flags, ocr_scale in review_queue:
+            try:
+                local_path = cache_dir / rel_path
+                _record_ok(file_id, rel_path, review_row(
+                    row, flags, local_path if local_path.exists() else None, countries, states, locations,
+                ), ocr_scale)
+            except Exception as e:
+                _record_error(file_id, rel_path, str(e))
+    finally:
+        if sink is not None:
+            print("Writing Excel workbook...")
+            sink.close()
+        if review_out is not None:
+            review_out.close()
+        progress_log.close()
+        _IO_POOL.shutdown(wait=True)
 
     print("\nDone.")
     print(f"  OK:   {ok_count}")
     print(f"  SKIP: {skip_count}")
     print(f"  ERR:  {err_count}")
-    print(f"Output: {out_xlsx}")
+    print(f"Output: {review_queue_path if args.phase == 'ocr' else out_xlsx}")
     print(f"Log:    {log_path}")
 
 if __name__ == "__main__":